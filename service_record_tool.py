@@ -1,16 +1,27 @@
 import csv
+import io
 import re
 import sys
+from copy import copy
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
 from openpyxl import load_workbook
 from openpyxl.styles import Alignment
+from openpyxl.utils import coordinate_to_tuple
 from openpyxl.utils.exceptions import InvalidFileException
 
+# pandas は任意依存：あればCSV読み込みがC実装で速くなる（無くても動く）
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 TEMPLATE_SHEET = "Format"
 
 CELL_MAP = {
@@ -25,6 +36,9 @@ CELL_MAP = {
     "slack": "A16",        # A16：行高固定（500px相当）
 }
 
+# CELL_MAP を (行, 列) に事前解決（ws[addr] の座標パースを毎シートやらない）
+_CELL_RC = {key: coordinate_to_tuple(addr) for key, addr in CELL_MAP.items()}
+
 ATTEND_VALUE = "出席"
 ABSENT_SKIP_VALUE = "欠席時対応"
 
@@ -40,8 +54,17 @@ MSG_MONTH_MISMATCH = "userCaseDailyとcaseMonth（caseDaily）の年月が合い
 MSG_CASE_NOT_SELECTED = "caseMonth（またはcaseDaily）が未選択です。"
 MSG_OUTDIR_NOT_SELECTED = "出力先が未選択です。"
 MSG_FILE_IN_USE = "ファイルにアクセスできません。別のプロセスが使用中です。"
+MSG_PAIR_NOT_FOUND = "ペアになるcaseMonth（caseDaily）が見つかりません: "
 MSG_TEMPLATE_NOT_FOUND = "java.io.FileNotFoundException.Sample_Format.xlsx(指定されたファイルが見つかりません。)"
 
+# 事前コンパイル済み正規表現（毎呼び出しの re キャッシュ参照を避ける）
+_YYYYMM_RE = re.compile(r"_(\d{6})")
+_DATE_RE = re.compile(r"^\s*(\d{4})/(\d{1,2})/(\d{1,2})\s*$")
+_HHMM_LOOSE_RE = re.compile(r"(\d{1,2}):(\d{2})(?::\d{2})?")
+_HHMM_JP_RE = re.compile(r"(\d{1,2})時(\d{1,2})分")
+_TIME_SPLIT_RE = re.compile(r"(\b\d{1,2}:\d{2}\b)")
+_YM_PREFIX_RE = re.compile(r"^(\d{4})/(\d{2})")
+
 
 def px_to_points(px: float) -> float:
     """
@@ -51,6 +74,7 @@ def px_to_points(px: float) -> float:
     return px * 0.75
 
 
+@lru_cache(maxsize=1)
 def get_base_folder() -> Path:
     # PyInstaller(onefile) 対策：exeのフォルダを基準
     if getattr(sys, "frozen", False):
@@ -72,29 +96,83 @@ def looks_like_caseMonth_or_caseDaily(path: Path) -> bool:
 
 
 def extract_yyyymm_from_filename(path: Path) -> Optional[str]:
-    m = re.search(r"_(\d{6})", path.name)
+    m = _YYYYMM_RE.search(path.name)
     return m.group(1) if m else None
 
 
-def detect_encoding(path: Path) -> str:
-    for enc in ("cp932", "shift_jis", "utf-8-sig", "utf-8"):
+def _sniff_encoding(buf: bytes, path: Path, truncated: bool = False) -> str:
+    if buf.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    # cp932 は shift_jis の上位互換なので cp932 → utf-8 の2択で足りる
+    for enc in ("cp932", "utf-8"):
         try:
-            with path.open("r", encoding=enc, newline="") as f:
-                f.read(4096)
+            buf.decode(enc)
             return enc
-        except Exception:
-            pass
+        except UnicodeDecodeError as e:
+            # 4KB窓でファイルを切った場合のみ、末尾のマルチバイト欠けをOK扱い
+            if truncated and e.start >= len(buf) - 4:
+                return enc
+    raise RuntimeError(f"文字コード判定失敗: {path}")
+
+
+def _decode_csv_bytes(raw: bytes, path: Path) -> str:
+    enc = _sniff_encoding(raw[:4096], path, truncated=len(raw) > 4096)
+    try:
+        return raw.decode(enc)
+    except UnicodeDecodeError:
+        # 先頭4KBだけでは判定を誤ることがある → 残りの候補で全文デコードを試す
+        for fallback in ("cp932", "utf-8"):
+            if fallback == enc:
+                continue
+            try:
+                return raw.decode(fallback)
+            except UnicodeDecodeError:
+                pass
     raise RuntimeError(f"文字コード判定失敗: {path}")
 
 
 def read_csv_dicts(path: Path) -> List[Dict[str, str]]:
-    enc = detect_encoding(path)
-    with path.open("r", encoding=enc, newline="") as f:
-        reader = csv.DictReader(f)
-        rows: List[Dict[str, str]] = []
-        for r in reader:
-            rows.append({(k or "").strip(): (v or "").strip() for k, v in r.items()})
-        return rows
+    # ファイルは1回だけ開く：判定もパースも同じバイト列に対して行う
+    raw = path.read_bytes()
+    text = _decode_csv_bytes(raw, path)
+
+    if pd is not None:
+        # dtype=str + keep_default_na=False で全セルを文字列のまま受ける。
+        # pyarrow エンジンが使えればマルチスレッドでさらに速い（無ければC実装）。
+        try:
+            try:
+                df = pd.read_csv(io.StringIO(text), dtype=str,
+                                 keep_default_na=False, engine="pyarrow")
+            except (ImportError, ValueError):
+                df = pd.read_csv(io.StringIO(text), dtype=str,
+                                 keep_default_na=False)
+        except pd.errors.EmptyDataError:
+            # 空CSVは csv.reader 側と同じく空リスト扱い（呼び出し元が日本語で報告する）
+            return []
+        df.columns = [(c or "").strip() for c in df.columns]
+        for col in df.columns:
+            df[col] = df[col].str.strip()
+        return df.to_dict("records")
+
+    # csv.reader + zip：ヘッダの strip は1回で済む（DictReader は行毎にdict構築）
+    reader = csv.reader(io.StringIO(text, newline=""))
+    header = [(name or "").strip() for name in next(reader, [])]
+    n_cols = len(header)
+    rows: List[Dict[str, str]] = []
+    for row in reader:
+        if len(row) < n_cols:
+            row += [""] * (n_cols - len(row))
+        rows.append(dict(zip(header, map(str.strip, row))))
+    return rows
+
+
+def sget(d: Dict[str, str], k: str, _strip=str.strip) -> str:
+    """
+    (d.get(k) or "").strip() の短縮形。str.strip をデフォルト引数に束縛。
+    文字列以外（pandas経由の欠損値など）は空文字扱い。
+    """
+    v = d.get(k)
+    return _strip(v) if isinstance(v, str) else ""
 
 
 # ====== ここが重要修正：日付を YYYY/MM/DD に統一（ゼロ埋め） ======
@@ -111,7 +189,7 @@ def normalize_date(s: str) -> str:
         return ""
 
     s = s.replace("-", "/")
-    m = re.match(r"^\s*(\d{4})/(\d{1,2})/(\d{1,2})\s*$", s)
+    m = _DATE_RE.match(s)
     if not m:
         return s  # 変な形式はそのまま（ただし一致しない可能性あり）
 
@@ -122,24 +200,34 @@ def normalize_date(s: str) -> str:
 # ===============================================================
 
 
+# シート名に使えない文字 → "_"（translate で1パス置換）
+_SHEET_NAME_TRANS = str.maketrans({c: "_" for c in ":/\\?*[]"})
+
+
 def safe_sheet_name(name: str) -> str:
-    for c in [":", "/", "\\", "?", "*", "[", "]"]:
-        name = name.replace(c, "_")
-    return name.strip()[:31]
+    return name.translate(_SHEET_NAME_TRANS).strip()[:31]
 
 
 # ===== 対応時間：「○時○分～○時○分」に寄せる =====
+# 時刻は15分刻みが大半でユニーク値が少ない → 整形結果をメモ化
+_HHMM_CACHE: Dict[Tuple[int, int], str] = {}
+
+
+def _fmt_hhmm(h: int, m: int) -> str:
+    s = _HHMM_CACHE.get((h, m))
+    if s is None:
+        s = f"{h}時{m:02d}分"
+        _HHMM_CACHE[(h, m)] = s
+    return s
+
+
 def parse_time_flexible(s: str) -> Optional[Tuple[int, int]]:
     s = (s or "").strip()
     if not s:
         return None
 
-    patterns = [
-        r"(\d{1,2}):(\d{2})(?::\d{2})?",
-        r"(\d{1,2})時(\d{1,2})分",
-    ]
-    for pat in patterns:
-        m = re.search(pat, s)
+    for pat in (_HHMM_LOOSE_RE, _HHMM_JP_RE):
+        m = pat.search(s)
         if m:
             h = int(m.group(1))
             mi = int(m.group(2))
@@ -153,14 +241,11 @@ def format_time_range_jp(start: str, end: str) -> str:
     pe = parse_time_flexible(end)
 
     if ps and pe:
-        sh, sm = ps
-        eh, em = pe
-        return f"{sh}時{sm:02d}分～{eh}時{em:02d}分"
+        return f"{_fmt_hhmm(*ps)}～{_fmt_hhmm(*pe)}"
 
     def fmt_one(p: Optional[Tuple[int, int]], raw: str) -> str:
         if p:
-            h, m = p
-            return f"{h}時{m:02d}分"
+            return _fmt_hhmm(*p)
         return (raw or "").strip()
 
     left = fmt_one(ps, start)
@@ -175,22 +260,26 @@ def format_time_range_jp(start: str, end: str) -> str:
 
 
 def remove_sample_sheets(wb) -> None:
-    targets = [name for name in wb.sheetnames if "sample" in name.lower()]
-    for name in targets:
+    # sheetnames はプロパティなので1回だけ評価する
+    names = wb.sheetnames
+    for name in [n for n in names if "sample" in n.lower()]:
         del wb[name]
 
 
 # ====== ここも重要修正：日付列が無い場合、中身が日付っぽい列を探す ======
+_DATE_COL_CANDIDATES = ("日付", "年月日", "支援実施日")
+_DATE_LIKE_RE = re.compile(r"^\s*\d{4}[-/]\d{1,2}[-/]\d{1,2}\s*$")
+
+
 def pick_date_column(daily_rows: List[Dict[str, str]]) -> str:
-    candidates = ["日付", "年月日", "支援実施日"]
     keys = list(daily_rows[0].keys())
 
-    for c in candidates:
+    for c in _DATE_COL_CANDIDATES:
         if c in keys:
             return c
 
     # 候補が無い場合：各列の値が yyyy/mm/dd or yyyy-mm-dd っぽい割合で決める
-    date_pat = re.compile(r"^\s*\d{4}[-/]\d{1,2}[-/]\d{1,2}\s*$")
+    date_pat = _DATE_LIKE_RE
     best_key = keys[0]
     best_score = -1
 
@@ -209,43 +298,89 @@ def pick_date_column(daily_rows: List[Dict[str, str]]) -> str:
 # ====================================================================
 
 
+def index_daily_by_date(daily_rows: List[Dict[str, str]], date_col: str) -> Dict[str, Dict[str, str]]:
+    """
+    正規化済み日付（YYYY/MM/DD）→ daily行 の索引を1パスで作る。
+    同一日付が複数ある場合は後勝ち（従来どおり）。
+    """
+    return {
+        key: r
+        for r in daily_rows
+        if (key := normalize_date(r.get(date_col, "")))
+    }
+
+
+# 日次索引キャッシュ：GUIで同じ userCaseDaily を複数回処理するとき再パースしない
+_DAILY_INDEX_CACHE: Dict[Tuple[str, int, int], Mapping[str, Dict[str, str]]] = {}
+
+
+def load_daily_index(path: Path) -> Mapping[str, Dict[str, str]]:
+    """
+    userCaseDaily を読み、正規化日付→行 の索引を返す。
+    同一ファイル（パス・mtime・サイズ一致）ならパース済み索引を再利用する。
+    戻り値は読み取り専用ビュー。
+    """
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    idx = _DAILY_INDEX_CACHE.get(key)
+    if idx is None:
+        daily_rows = read_csv_dicts(path)
+        if not daily_rows:
+            raise RuntimeError("userCaseDailyが空です。")
+        date_col = pick_date_column(daily_rows)
+        idx = MappingProxyType(index_daily_by_date(daily_rows, date_col))
+        if len(_DAILY_INDEX_CACHE) >= 4:
+            _DAILY_INDEX_CACHE.clear()
+        _DAILY_INDEX_CACHE[key] = idx
+    return idx
+
+
+# 連絡専用列の候補（備考/備考欄は絶対に入れない）
+_DAILY_CONTACT_KEYS = (
+    "本人との連絡",
+    "本人との連絡（チャット）",
+    "本人との連絡（Slack）",
+    "連絡事項",
+    "連絡",
+)
+
+
 def pick_daily_contact_only(daily: Dict[str, str]) -> str:
     """
     A16 に userCaseDaily の「備考」（Y列相当）が混ざるのを防ぐ。
     連絡専用列だけ拾う。備考/備考欄は絶対に使わない。
     """
-    candidates = [
-        "本人との連絡",
-        "本人との連絡（チャット）",
-        "本人との連絡（Slack）",
-        "連絡事項",
-        "連絡",
-    ]
-    for c in candidates:
-        v = (daily.get(c) or "").strip()
+    for c in _DAILY_CONTACT_KEYS:
+        v = sget(daily, c)
         if v:
             return v
     return ""
 
 
-def build_program(d: Dict[str, str]) -> str:
-    out: List[str] = []
+_PROGRAM_KEYS = (
+    ("午前のプログラム", "午前のプログラム詳細"),
+    ("午後1のプログラム", "午後1のプログラム詳細"),
+    ("午後2のプログラム", "午後2のプログラム詳細"),
+    ("終日のプログラム", "終日のプログラム詳細"),
+)
 
-    def add(p, detail):
-        p = (p or "").strip()
-        detail = (detail or "").strip()
-        if p or detail:
-            out.append(p + ("\n" + detail if (p and detail) else detail))
 
-    add(d.get("午前のプログラム", ""), d.get("午前のプログラム詳細", ""))
-    add(d.get("午後1のプログラム", ""), d.get("午後1のプログラム詳細", ""))
-    add(d.get("午後2のプログラム", ""), d.get("午後2のプログラム詳細", ""))
-    add(d.get("終日のプログラム", ""), d.get("終日のプログラム詳細", ""))
-    return "\n".join(out)
+def build_program(d: Dict[str, str]) -> str:
+    parts: List[str] = []
+    for pk, dk in _PROGRAM_KEYS:
+        p = sget(d, pk)
+        detail = sget(d, dk)
+        if p and detail:
+            parts.append(p + "\n" + detail)
+        elif p or detail:
+            parts.append(p or detail)
+    return "\n".join(parts)
 
 
 def normalize_method(raw: str) -> str:
-    raw = raw or ""
+    # 大半の行は空欄 → 既定の「事業所」で即返す
+    if not raw:
+        return "事業所"
     if "在宅" in raw and "通所" not in raw:
         return "利用者宅"
     return "事業所"
@@ -262,92 +397,269 @@ def format_contact_text(raw: str) -> str:
     if not text:
         return ""
 
-    parts = re.split(r"(\b\d{1,2}:\d{2}\b)", text)
-    if len(parts) == 1:
-        body = text
-        return (body[:30] + "・・・・") if len(body) > 30 else body
+    parts = _TIME_SPLIT_RE.split(text)
+    n = len(parts)
+    if n == 1:
+        return text[:30] + "・・・・" if len(text) > 30 else text
 
+    # キャプチャ付き split なので奇数番目が必ず時刻トークン
     lines: List[str] = []
-    i = 0
-    while i < len(parts):
-        seg = parts[i]
-        if re.fullmatch(r"\b\d{1,2}:\d{2}\b", seg or ""):
-            t = seg
-            msg = (parts[i + 1] if i + 1 < len(parts) else "").strip()
-            if len(msg) > 30:
-                msg = msg[:30] + "・・・・"
-            lines.append(f"{t} {msg}".rstrip())
-            i += 2
-        else:
-            i += 1
-
-    return "\n".join([ln for ln in lines if ln])
-
-
-def set_wrap_only(ws, addr: str, horizontal_default="left", vertical_default="top"):
+    for i in range(1, n, 2):
+        t = parts[i]
+        msg = parts[i + 1].strip() if i + 1 < n else ""
+        if len(msg) > 30:
+            msg = msg[:30] + "・・・・"
+        lines.append(f"{t} {msg}".rstrip())
+
+    return "\n".join(lines)
+
+
+# G5用の中央揃え：全シート共通なので1個だけ作る
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+
+# wrap用 Alignment のキャッシュ：クローン元が同じならシート毎に作り直さない
+_WRAP_ALIGN_CACHE: Dict[Tuple, Alignment] = {}
+
+
+def set_wrap_only(cell, horizontal_default="left", vertical_default="top"):
     """
     列幅等は一切変更しない。
     wrap_text だけオンにする（既存の揃えは極力維持）。
     """
-    cell = ws[addr]
     a = cell.alignment if cell.alignment else Alignment()
-    ws[addr].alignment = Alignment(
-        horizontal=a.horizontal if a.horizontal else horizontal_default,
-        vertical=a.vertical if a.vertical else vertical_default,
-        text_rotation=a.text_rotation,
-        wrap_text=True,
-        shrinkToFit=False,
-        indent=a.indent,
+    key = (
+        a.horizontal if a.horizontal else horizontal_default,
+        a.vertical if a.vertical else vertical_default,
+        a.text_rotation,
+        a.indent,
     )
+    al = _WRAP_ALIGN_CACHE.get(key)
+    if al is None:
+        al = Alignment(
+            horizontal=key[0],
+            vertical=key[1],
+            text_rotation=a.text_rotation,
+            wrap_text=True,
+            shrinkToFit=False,
+            indent=a.indent,
+        )
+        _WRAP_ALIGN_CACHE[key] = al
+    cell.alignment = al
 
 
-def set_row_height_px(ws, addr: str, height_px: float):
-    row = ws[addr].row
+def set_row_height_px(ws, row: int, height_px: float):
     ws.row_dimensions[row].height = px_to_points(height_px)
 
 
-def ask_paths() -> Tuple[Optional[Path], Optional[Path], Optional[Path]]:
+def snapshot_template(tpl) -> Dict[str, object]:
+    """
+    Format シートを複製用の平データへ1回だけ展開する。
+    copy_worksheet はシート毎にセル走査と has_style 等の判定をやり直すが、
+    テンプレは固定なので走査は1回で足りる。
+    """
+    cells = [
+        (
+            row, col,
+            c._value, c.data_type,
+            c._style if c.has_style else None,
+            c.hyperlink, c.comment,
+        )
+        for (row, col), c in tpl._cells.items()
+    ]
+    return {
+        "cells": cells,
+        "merged_cells": tpl.merged_cells,
+        "row_dims": list(tpl.row_dimensions.items()),
+        "col_dims": list(tpl.column_dimensions.items()),
+        "sheet_format": tpl.sheet_format,
+        "sheet_properties": tpl.sheet_properties,
+        "page_margins": tpl.page_margins,
+        "page_setup": tpl.page_setup,
+        "print_options": tpl.print_options,
+    }
+
+
+def clone_template_sheet(wb, snap: Dict[str, object], title: str):
+    """snapshot_template の結果から新しいシートを末尾に作る。"""
+    ws = wb.create_sheet(title=title)
+
+    cell = ws.cell
+    for row, col, value, data_type, style, link, comment in snap["cells"]:
+        c = cell(row=row, column=col)
+        c._value = value
+        c.data_type = data_type
+        if style is not None:
+            # StyleArray は属性代入で書き換わるためシート毎にコピーする
+            c._style = copy(style)
+        if link is not None:
+            c._hyperlink = copy(link)
+        if comment is not None:
+            c.comment = copy(comment)
+
+    for key, dim in snap["row_dims"]:
+        d = copy(dim)
+        d.worksheet = ws
+        ws.row_dimensions[key] = d
+    for key, dim in snap["col_dims"]:
+        d = copy(dim)
+        d.worksheet = ws
+        ws.column_dimensions[key] = d
+
+    ws.merged_cells = copy(snap["merged_cells"])
+    ws.sheet_format = copy(snap["sheet_format"])
+    ws.sheet_properties = copy(snap["sheet_properties"])
+    ws.page_margins = copy(snap["page_margins"])
+    ws.page_setup = copy(snap["page_setup"])
+    ws.print_options = copy(snap["print_options"])
+    return ws
+
+
+# 体温も同一値の繰り返しが多い → 「36.5℃」等の整形結果をメモ化
+_TEMP_CACHE: Dict[str, str] = {}
+
+
+def _fmt_temp(temp: str) -> str:
+    s = _TEMP_CACHE.get(temp)
+    if s is None:
+        s = f"{temp}℃"
+        _TEMP_CACHE[temp] = s
+    return s
+
+
+# スナップショットもテンプレ実体（パス・mtime・サイズ）単位で再利用する。
+# 同一バイト列の再ロードはスタイル表も同一になるので、別ロードの
+# Workbook へ流用してもスタイル参照はずれない。
+_TEMPLATE_SNAPSHOT_CACHE: Dict[Tuple[str, int, int], Dict[str, object]] = {}
+
+
+def get_template_snapshot(template_path: Path, tpl) -> Dict[str, object]:
+    st = template_path.stat()
+    key = (str(template_path), st.st_mtime_ns, st.st_size)
+    snap = _TEMPLATE_SNAPSHOT_CACHE.get(key)
+    if snap is None:
+        _TEMPLATE_SNAPSHOT_CACHE.clear()
+        snap = snapshot_template(tpl)
+        _TEMPLATE_SNAPSHOT_CACHE[key] = snap
+    return snap
+
+
+def build_row_values(r: Dict[str, str], daily: Dict[str, str], date: str) -> Dict[str, str]:
+    """
+    1行分（1シート分）の書き込み値を CELL_MAP のキーで揃えた辞書にまとめる。
+    セルへの書き込みは stamp_sheet 側でまとめて行う。
+    """
+    temp = sget(daily, "体温")
+
+    daily_contact = pick_daily_contact_only(daily)
+    cm_note = sget(r, "備考") or sget(r, "実績記録票備考欄")
+    raw_contact = daily_contact or cm_note
+
+    return {
+        "office": r.get("事業所名", ""),
+        "date": date,
+        "user": r.get("氏名", ""),
+        "time": format_time_range_jp(
+            r.get("実績開始時間", ""),
+            r.get("実績終了時間", "")
+        ),
+        "method": normalize_method(r.get("実績記録票備考欄", "")),
+        "program": build_program(daily),
+        "dayreport": r.get("日報", ""),
+        "temp": "未検温" if temp == "" else _fmt_temp(temp),
+        "slack": format_contact_text(raw_contact),
+    }
+
+
+def stamp_sheet(ws, values: Dict[str, str]) -> None:
+    """build_row_values の結果をテンプレ複製済みシートへ書き込む。"""
+    cell = ws.cell
+    cells = {key: cell(row=row, column=col) for key, (row, col) in _CELL_RC.items()}
+    for key, c in cells.items():
+        c.value = values[key]
+
+    # G5（対応手段：中央揃え）
+    cells["method"].alignment = _CENTER_ALIGN
+
+    # A11（日報）
+    dayreport = cells["dayreport"]
+    set_wrap_only(dayreport, horizontal_default="left", vertical_default="top")
+    set_row_height_px(ws, dayreport.row, A11_HEIGHT_PX)
+
+    # A16（本人との連絡）
+    slack = cells["slack"]
+    set_wrap_only(slack, horizontal_default="left", vertical_default="top")
+    set_row_height_px(ws, slack.row, A16_HEIGHT_PX)
+
+
+def pair_csvs_by_month(user_paths: List[Path], case_paths: List[Path]) -> List[Tuple[Path, Path]]:
+    """
+    userCaseDaily と caseMonth（caseDaily）をファイル名の _YYYYMM で突き合わせる。
+    ペアが見つからない userCaseDaily があれば ValueError。
+    """
+    case_by_month = {extract_yyyymm_from_filename(p): p for p in case_paths}
+    pairs: List[Tuple[Path, Path]] = []
+    for u in user_paths:
+        c = case_by_month.get(extract_yyyymm_from_filename(u))
+        if c is None:
+            raise ValueError(MSG_PAIR_NOT_FOUND + u.name)
+        pairs.append((u, c))
+    return pairs
+
+
+def ask_paths() -> Tuple[List[Tuple[Path, Path]], Optional[Path]]:
+    """
+    CSVは複数選択可。月が複数あってもテンプレ読み込みは
+    バイト列キャッシュで1回分に均される。
+    """
     root = tk.Tk()
     root.withdraw()
 
-    user_path_str = filedialog.askopenfilename(
-        title="userCaseDailyを選択",
+    user_path_strs = filedialog.askopenfilenames(
+        title="userCaseDailyを選択（複数可）",
         filetypes=[("CSV", "*.csv"), ("All files", "*.*")]
     )
-    if not user_path_str:
-        return None, None, None
-    user_path = Path(user_path_str)
-
-    if not is_csv(user_path):
-        messagebox.showerror("エラー", MSG_NOT_CSV)
-        return None, None, None
-    if not looks_like_userCaseDaily(user_path):
-        messagebox.showerror("エラー", MSG_NOT_USERCASEDAILY)
-        return None, None, None
-
-    case_path_str = filedialog.askopenfilename(
-        title="caseMonth（またはcaseDaily）を選択",
+    if not user_path_strs:
+        return [], None
+    user_paths = [Path(s) for s in user_path_strs]
+
+    for p in user_paths:
+        if not is_csv(p):
+            messagebox.showerror("エラー", MSG_NOT_CSV)
+            return [], None
+        if not looks_like_userCaseDaily(p):
+            messagebox.showerror("エラー", MSG_NOT_USERCASEDAILY)
+            return [], None
+
+    case_path_strs = filedialog.askopenfilenames(
+        title="caseMonth（またはcaseDaily）を選択（複数可）",
         filetypes=[("CSV", "*.csv"), ("All files", "*.*")]
     )
-    if not case_path_str:
+    if not case_path_strs:
         messagebox.showerror("エラー", MSG_CASE_NOT_SELECTED)
-        return None, None, None
-    case_path = Path(case_path_str)
+        return [], None
+    case_paths = [Path(s) for s in case_path_strs]
 
-    if not is_csv(case_path):
-        messagebox.showerror("エラー", MSG_NOT_CSV)
-        return None, None, None
-    if not looks_like_caseMonth_or_caseDaily(case_path):
-        messagebox.showerror("エラー", MSG_NOT_CASE_MONTH_DAILY)
-        return None, None, None
+    for p in case_paths:
+        if not is_csv(p):
+            messagebox.showerror("エラー", MSG_NOT_CSV)
+            return [], None
+        if not looks_like_caseMonth_or_caseDaily(p):
+            messagebox.showerror("エラー", MSG_NOT_CASE_MONTH_DAILY)
+            return [], None
+
+    try:
+        pairs = pair_csvs_by_month(user_paths, case_paths)
+    except ValueError as e:
+        messagebox.showerror("エラー", str(e))
+        return [], None
 
     outdir_str = filedialog.askdirectory(title="出力先フォルダを選択")
     if not outdir_str:
         messagebox.showerror("エラー", MSG_OUTDIR_NOT_SELECTED)
-        return None, None, None
+        return [], None
     outdir = Path(outdir_str)
 
-    return user_path, case_path, outdir
+    return pairs, outdir
 
 
 def ensure_same_month(user_path: Path, case_path: Path) -> None:
@@ -358,14 +670,15 @@ def ensure_same_month(user_path: Path, case_path: Path) -> None:
 
 
 def build_output_filename(case_rows: List[Dict[str, str]], yyyymm: Optional[str]) -> str:
-    name = (case_rows[0].get("氏名") or "").strip() or "名前未設定"
+    name = sget(case_rows[0], "氏名") or "名前未設定"
     if not yyyymm:
         d = normalize_date(case_rows[0].get("年月日", ""))
-        m = re.match(r"^(\d{4})/(\d{2})", d)
+        m = _YM_PREFIX_RE.match(d)
         yyyymm = f"{m.group(1)}{m.group(2)}" if m else "YYYYMM"
     return f"{name}_{yyyymm}_サービス支援記録.xlsx"
 
 
+@lru_cache(maxsize=4)
 def load_template_or_fail(base: Path) -> Path:
     tpl = base / "Sample_Format.xlsx"
     if not tpl.exists():
@@ -373,30 +686,61 @@ def load_template_or_fail(base: Path) -> Path:
     return tpl
 
 
-def generate(user_csv: Path, case_csv: Path, outdir: Path) -> Path:
+# テンプレのバイト列キャッシュ：(パス, mtime, サイズ) が同じなら再読み込みしない
+_TEMPLATE_BYTES_CACHE: Dict[Tuple[str, int, int], bytes] = {}
+
+
+def load_template_workbook(template_path: Path):
+    """
+    テンプレを load_workbook する。
+    生成時にシートを追加してしまうので Workbook 自体はキャッシュできない。
+    代わりに生バイト列をキャッシュし、2回目以降はディスクI/Oを省く。
+    """
+    st = template_path.stat()
+    key = (str(template_path), st.st_mtime_ns, st.st_size)
+    data = _TEMPLATE_BYTES_CACHE.get(key)
+    if data is None:
+        _TEMPLATE_BYTES_CACHE.clear()
+        data = template_path.read_bytes()
+        _TEMPLATE_BYTES_CACHE[key] = data
+    return load_workbook(io.BytesIO(data), data_only=True, keep_links=False, rich_text=False)
+
+
+def resolve_output_path(case_rows: List[Dict[str, str]], user_csv: Path, case_csv: Path,
+                        outdir: Path) -> Path:
+    yyyymm = extract_yyyymm_from_filename(case_csv) or extract_yyyymm_from_filename(user_csv)
+    return outdir / build_output_filename(case_rows, yyyymm)
+
+
+def generate(user_csv: Path, case_csv: Path, outdir: Path, overwrite: bool = False) -> Path:
+    """
+    UIを呼ばない純粋な生成処理。上書き確認は呼び出し側（main）で済ませ、
+    許可済みなら overwrite=True で呼ぶ。
+    """
     base = get_base_folder()
     template_path = load_template_or_fail(base)
 
     ensure_same_month(user_csv, case_csv)
 
     case_rows = read_csv_dicts(case_csv)
-    daily_rows = read_csv_dicts(user_csv)
     if not case_rows:
         raise RuntimeError("caseMonth（caseDaily）が空です。")
-    if not daily_rows:
-        raise RuntimeError("userCaseDailyが空です。")
+    daily_by_date = load_daily_index(user_csv)
 
-    yyyymm = extract_yyyymm_from_filename(case_csv) or extract_yyyymm_from_filename(user_csv)
-    out_name = build_output_filename(case_rows, yyyymm)
-    out_path = outdir / out_name
+    out_path = resolve_output_path(case_rows, user_csv, case_csv, outdir)
 
     if out_path.exists():
-        msg = f"このフォルダーには’{out_name}’は存在します。上書きしますか？"
-        if not messagebox.askyesno("確認", msg):
-            raise RuntimeError("キャンセルしました。")
+        if not overwrite:
+            raise RuntimeError(f"’{out_path.name}’は既に存在します。")
+        # Excel等が掴んだままなら、全シートを作ってから save で死ぬ前にここで落とす
+        try:
+            with out_path.open("ab"):
+                pass
+        except PermissionError:
+            raise PermissionError(MSG_FILE_IN_USE)
 
     try:
-        wb = load_workbook(template_path)
+        wb = load_template_workbook(template_path)
     except (InvalidFileException, Exception) as e:
         raise RuntimeError(f"テンプレ読み込み失敗: {e}")
 
@@ -405,81 +749,52 @@ def generate(user_csv: Path, case_csv: Path, outdir: Path) -> Path:
     if TEMPLATE_SHEET not in wb.sheetnames:
         raise RuntimeError(f"テンプレに '{TEMPLATE_SHEET}' シートがありません。")
     tpl = wb[TEMPLATE_SHEET]
-
-    date_col = pick_date_column(daily_rows)
-    daily_by_date: Dict[str, Dict[str, str]] = {}
-    for r in daily_rows:
-        key = normalize_date(r.get(date_col, ""))
-        if key:
-            daily_by_date[key] = r
+    tpl_snapshot = get_template_snapshot(template_path, tpl)
 
     required = ["事業所名", "氏名", "年月日", "出欠等", "実績開始時間", "実績終了時間"]
     for c in required:
         if c not in case_rows[0]:
             raise RuntimeError(f"caseMonth（caseDaily）に必須列がありません: {c}")
 
-    for r in case_rows:
-        status = (r.get("出欠等", "") or "").strip()
-        if status == ABSENT_SKIP_VALUE:
-            continue
-        if status != ATTEND_VALUE:
-            continue
+    # 出席行だけ先に絞る（欠席時対応などはここで落ちる）。日付正規化も1回だけ。
+    attending = [
+        (date, r)
+        for r in case_rows
+        if sget(r, "出欠等") == ATTEND_VALUE
+        if (date := normalize_date(r.get("年月日", "")))
+    ]
+    if not attending:
+        raise RuntimeError("出席の行がありません。")
 
-        date = normalize_date(r.get("年月日", ""))
-        if not date:
-            continue
+    # wb.sheetnames はアクセス毎にリストを作り直すプロパティなので set で持つ
+    used_names = set(wb.sheetnames)
 
+    # フェーズ1：シート名と書き込み値だけ先に確定させる（Workbookに触らない）
+    sheet_payloads: List[Tuple[str, Dict[str, str]]] = []
+    for date, r in attending:
         daily = daily_by_date.get(date, {})
 
         sheet_base = f"{date.replace('/','')[:8]}_{(r.get('氏名','') or '').strip()}"
         sheet_name = safe_sheet_name(sheet_base)
-        if sheet_name in wb.sheetnames:
+        if sheet_name in used_names:
             k = 2
             while True:
                 cand = safe_sheet_name(f"{sheet_base}_{k}")
-                if cand not in wb.sheetnames:
+                if cand not in used_names:
                     sheet_name = cand
                     break
                 k += 1
+        used_names.add(sheet_name)
 
-        ws = wb.copy_worksheet(tpl)
-        ws.title = sheet_name
-
-        ws[CELL_MAP["office"]].value = r.get("事業所名", "")
-        ws[CELL_MAP["date"]].value = date
-        ws[CELL_MAP["user"]].value = r.get("氏名", "")
-
-        ws[CELL_MAP["time"]].value = format_time_range_jp(
-            r.get("実績開始時間", ""),
-            r.get("実績終了時間", "")
-        )
-
-        method_cell = ws[CELL_MAP["method"]]
-        method_cell.value = normalize_method(r.get("実績記録票備考欄", ""))
-        method_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # A9（プログラム）
-        ws[CELL_MAP["program"]].value = build_program(daily)
-
-        # A11（日報）
-        ws[CELL_MAP["dayreport"]].value = r.get("日報", "")
-        set_wrap_only(ws, CELL_MAP["dayreport"], horizontal_default="left", vertical_default="top")
-        set_row_height_px(ws, CELL_MAP["dayreport"], A11_HEIGHT_PX)
+        sheet_payloads.append((sheet_name, build_row_values(r, daily, date)))
 
-        # B13（体温）
-        temp = (daily.get("体温", "") or "").strip()
-        ws[CELL_MAP["temp"]].value = "未検温" if temp == "" else f"{temp}℃"
+    # フェーズ2：テンプレ複製と書き込み
+    for sheet_name, values in sheet_payloads:
+        ws = clone_template_sheet(wb, tpl_snapshot, sheet_name)
+        stamp_sheet(ws, values)
 
-        # A16（本人との連絡）
-        daily_contact = pick_daily_contact_only(daily)
-        cm_note = (r.get("備考") or r.get("実績記録票備考欄") or "").strip()
-        raw_contact = daily_contact or cm_note
-
-        ws[CELL_MAP["slack"]].value = format_contact_text(raw_contact)
-        set_wrap_only(ws, CELL_MAP["slack"], horizontal_default="left", vertical_default="top")
-        set_row_height_px(ws, CELL_MAP["slack"], A16_HEIGHT_PX)
-
-    remove_sample_sheets(wb)
+    # テンプレ（Format）は出力に残さない（attending が空でないことは確認済み）
+    del wb[TEMPLATE_SHEET]
 
     try:
         wb.save(out_path)
@@ -490,18 +805,34 @@ def generate(user_csv: Path, case_csv: Path, outdir: Path) -> Path:
 
 
 def main():
-    root = tk.Tk()
-    root.withdraw()
-
-    user_path, case_path, outdir = ask_paths()
-    if user_path is None and case_path is None and outdir is None:
+    # Tk の初期化は ask_paths 側の1回だけ（Tcl起動は数十msかかる）
+    pairs, outdir = ask_paths()
+    if not pairs or outdir is None:
         return
 
-    try:
-        out_path = generate(user_path, case_path, outdir)
-        messagebox.showinfo("完了", f"保存しました。\n{out_path}")
-    except Exception as e:
-        messagebox.showerror("エラー", str(e))
+    saved: List[Path] = []
+    errors: List[str] = []
+    for user_path, case_path in pairs:
+        try:
+            # 上書き確認はここで済ませ、generate はUIなしで回す
+            overwrite = False
+            case_rows = read_csv_dicts(case_path)
+            if case_rows:
+                out_path = resolve_output_path(case_rows, user_path, case_path, outdir)
+                if out_path.exists():
+                    msg = f"このフォルダーには’{out_path.name}’は存在します。上書きしますか？"
+                    if not messagebox.askyesno("確認", msg):
+                        errors.append(f"{user_path.name}: キャンセルしました。")
+                        continue
+                    overwrite = True
+            saved.append(generate(user_path, case_path, outdir, overwrite=overwrite))
+        except Exception as e:
+            errors.append(f"{user_path.name}: {e}")
+
+    if errors:
+        messagebox.showerror("エラー", "\n".join(errors))
+    if saved:
+        messagebox.showinfo("完了", "保存しました。\n" + "\n".join(str(p) for p in saved))
 
 
 if __name__ == "__main__":